@@ -2,13 +2,29 @@
 Charsetrs - A Python library with Rust bindings for charset detection
 """
 
+import os
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from contextlib import suppress
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock
+from types import MappingProxyType
 from typing import Literal
 
+from charsetrs._internal import (
+    analyse_from_bytes as _analyse_from_bytes_internal,
+)
 from charsetrs._internal import (
     analyse_from_path_stream as _analyse_from_path_stream_internal,
 )
+from charsetrs._internal import (
+    analyse_many_from_paths_stream as _analyse_many_from_paths_stream_internal,
+)
+from charsetrs._internal import (
+    is_encoding_supported as _is_encoding_supported_internal,
+)
 from charsetrs._internal import (
     normalize_file_stream as _normalize_file_stream_internal,
 )
@@ -17,13 +33,42 @@ __version__ = "0.2.0"
 
 __all__ = [
     "analyse",
+    "analyse_bytes",
+    "analyse_many",
     "normalize",
     "AnalysisResult",
     "__version__",
 ]
 
+# Map common encoding aliases, built once at import instead of on every call
+_ENCODING_ALIASES: Mapping[str, tuple[str, ...]] = MappingProxyType(
+    {
+        "utf_8": ("utf8",),
+        "utf_16": ("utf16",),
+        "latin_1": ("iso_8859_1", "latin1"),
+        "cp1252": ("windows_1252",),
+    }
+)
+
+# Flat alias -> canonical name lookup, so equivalence is two dict lookups
+_ALIAS_TO_CANONICAL: Mapping[str, str] = MappingProxyType(
+    {alias: canonical for canonical, aliases in _ENCODING_ALIASES.items() for alias in (canonical, *aliases)}
+)
+
+_VALID_NEWLINES = frozenset(("LF", "CRLF", "CR"))
+
+# Lowercase ASCII letters and turn hyphens into underscores in a single pass
+_ENCODING_NAME_TABLE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ-", "abcdefghijklmnopqrstuvwxyz_")
+
+# Files known to already be in a normalize() target format, most recently used last.
+# Keys are (path, st_dev, st_ino, st_mtime_ns, st_size, encoding, newlines), so any change
+# to the file on disk misses the cache.
+_NORMALIZED_CACHE_SIZE = 1024
+_normalized_cache: OrderedDict[tuple[str, int, int, int, int, str, str], None] = OrderedDict()
+_normalized_cache_lock = Lock()
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnalysisResult:
     """Result of file analysis containing encoding and newline style information."""
 
@@ -44,6 +89,16 @@ def analyse(
     strategy that reads from the beginning, middle, and end of the file without
     loading the entire file into memory.
 
+    The GIL is released while the file is read and scored, so it is safe to call from
+    several threads at once (e.g. a ThreadPoolExecutor) to analyse files in parallel.
+
+    Results are memoized for the lifetime of the process (up to 1024 entries), keyed on the
+    path, the file's device, inode, modification time and size, and the sampling parameters.
+    A file rewritten in place with the same size and modification time (e.g. on a filesystem
+    with coarse timestamps) gets the earlier result back. normalize() detects the source
+    format through the same memoized results; analyse_bytes() and analyse_many() are not
+    memoized.
+
     Args:
         file_path: Path to the file to analyse (string or Path object)
         min_sample_size: Minimum number of bytes to sample. Default is 1MB.
@@ -79,49 +134,160 @@ def analyse(
         >>> print(result.encoding)
         'windows_1252'
     """
-    if isinstance(file_path, str):
-        file_path = Path(file_path)
-
-    file_path = file_path.absolute()
-    if file_path.is_dir():
-        raise ValueError(f"Provided path '{file_path}' is a directory, expected a file path.")
+    # A single stat both rejects missing files and keys the cache, so a file that changed
+    # on disk (new mtime, size or inode) is analysed again
+    file_path = os.fspath(file_path)
+    stat_result = os.stat(file_path)
+    return _analyse_cached(
+        file_path,
+        stat_result.st_dev,
+        stat_result.st_ino,
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+        min_sample_size,
+        percentage_sample_size,
+        max_sample_size,
+    )
 
-    if file_path.exists() is False:
-        raise FileNotFoundError(f"File '{file_path}' does not exist.")
 
-    rust_result = _analyse_from_path_stream_internal(
-        file_path.as_posix(), min_sample_size, percentage_sample_size, max_sample_size
+@lru_cache(maxsize=1024)
+def _analyse_cached(
+    file_path: str,
+    st_dev: int,
+    st_ino: int,
+    st_mtime_ns: int,
+    st_size: int,
+    min_sample_size: int,
+    percentage_sample_size: float,
+    max_sample_size: int | None,
+) -> AnalysisResult:
+    # Rust opens the file itself, raising ValueError for directories
+    encoding, newlines = _analyse_from_path_stream_internal(
+        file_path, min_sample_size, percentage_sample_size, max_sample_size
     )
-    return AnalysisResult(
-        encoding=rust_result.encoding,
-        newlines=rust_result.newlines,
+    return AnalysisResult(encoding=encoding, newlines=newlines)
+
+
+def analyse_bytes(
+    data: bytes | bytearray | memoryview,
+    min_sample_size: int = 1024 * 1024,
+    percentage_sample_size: float = 0.1,
+    max_sample_size: int | None = None,
+) -> AnalysisResult:
+    """
+    Analyse the encoding and newline style of data that is already in memory.
+
+    Uses the same sampling strategy as analyse(), so in-memory content (uploads, archive
+    members, ...) does not have to be written to a temporary file first. Any object
+    supporting the buffer protocol is accepted and only the sampled regions are copied.
+
+    Args:
+        data: The raw content to analyse
+        min_sample_size: Minimum number of bytes to sample. Default is 1MB.
+        percentage_sample_size: Percentage of the data to sample (0.0 to 1.0). Default is 0.1 (10%).
+        max_sample_size: Optional maximum number of bytes to sample. Default is None.
+
+    Returns:
+        AnalysisResult: Object containing encoding and newlines information
+
+    Raises:
+        ValueError: If data is empty
+
+    Examples:
+        >>> import charsetrs
+        >>> result = charsetrs.analyse_bytes(b"Hello World!\r\n")
+        >>> print(result.newlines)
+        'CRLF'
+    """
+    encoding, newlines = _analyse_from_bytes_internal(data, min_sample_size, percentage_sample_size, max_sample_size)
+    return AnalysisResult(encoding=encoding, newlines=newlines)
+
+
+def analyse_many(
+    file_paths: Sequence[str | Path],
+    min_sample_size: int = 1024 * 1024,
+    percentage_sample_size: float = 0.1,
+    max_sample_size: int | None = None,
+) -> list[AnalysisResult]:
+    """
+    Analyse the encoding and newline style of several files in a single call.
+
+    Equivalent to calling analyse() on each path, but all files are analysed in one
+    call into Rust, which avoids the per-call overhead when handling many small files.
+
+    Args:
+        file_paths: Paths to the files to analyse (strings or Path objects)
+        min_sample_size: Minimum number of bytes to sample per file. Default is 1MB.
+        percentage_sample_size: Percentage of each file to sample (0.0 to 1.0). Default is 0.1 (10%).
+        max_sample_size: Optional maximum number of bytes to sample per file. Default is None.
+
+    Returns:
+        list[AnalysisResult]: One result per path, in the same order as file_paths
+
+    Examples:
+        >>> import charsetrs
+        >>> results = charsetrs.analyse_many(["a.txt", "b.txt"])
+        >>> [result.encoding for result in results]
+        ['utf_8', 'windows_1252']
+    """
+    rust_results = _analyse_many_from_paths_stream_internal(
+        [os.fspath(path) for path in file_paths], min_sample_size, percentage_sample_size, max_sample_size
     )
+    return [AnalysisResult(encoding, newlines) for encoding, newlines in rust_results]
+
+
+@lru_cache(maxsize=256)
+def _normalize_encoding_name(encoding: str) -> str:
+    """Normalize an encoding name for comparison (lowercase, underscores instead of hyphens)."""
+    return encoding.translate(_ENCODING_NAME_TABLE)
 
 
 def _encodings_are_equivalent(source_enc: str, target_enc: str) -> bool:
     """Check if two encoding names are equivalent, considering common aliases."""
-    source_normalized = source_enc.lower().replace("-", "_")
-    target_normalized = target_enc.lower().replace("-", "_")
-
-    if source_normalized == target_normalized:
+    # Identical names (the common case) need no normalization or alias lookup
+    if source_enc == target_enc:
         return True
 
-    # Map common encoding aliases
-    encoding_aliases = {
-        "utf_8": ["utf8"],
-        "utf_16": ["utf16"],
-        "latin_1": ["iso_8859_1", "latin1"],
-        "cp1252": ["windows_1252"],
-    }
+    source_normalized = _normalize_encoding_name(source_enc)
+    target_normalized = _normalize_encoding_name(target_enc)
+
+    # Both names are equivalent if they resolve to the same canonical encoding
+    source_canonical = _ALIAS_TO_CANONICAL.get(source_normalized, source_normalized)
+    target_canonical = _ALIAS_TO_CANONICAL.get(target_normalized, target_normalized)
+    return source_canonical == target_canonical
+
+
+def _normalized_cache_key(
+    file_path: str, stat_result: os.stat_result, encoding: str, newlines: str
+) -> tuple[str, int, int, int, int, str, str]:
+    """Build the _normalized_cache key for one version of a file and a normalize() target."""
+    return (
+        file_path,
+        stat_result.st_dev,
+        stat_result.st_ino,
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+        encoding,
+        newlines,
+    )
 
-    # Check if both encodings are aliases of the same canonical encoding
-    for canonical, aliases in encoding_aliases.items():
-        # Include canonical name in the set of valid aliases
-        all_aliases = {canonical, *aliases}
-        if source_normalized in all_aliases and target_normalized in all_aliases:
-            return True
 
-    return False
+def _is_known_normalized(key: tuple[str, int, int, int, int, str, str]) -> bool:
+    """Check whether a file version is known to be in the target format, marking it as recently used."""
+    with _normalized_cache_lock:
+        if key not in _normalized_cache:
+            return False
+        _normalized_cache.move_to_end(key)
+        return True
+
+
+def _remember_normalized(key: tuple[str, int, int, int, int, str, str]) -> None:
+    """Record a file version as being in the target format, evicting the least recently used entry."""
+    with _normalized_cache_lock:
+        _normalized_cache[key] = None
+        _normalized_cache.move_to_end(key)
+        if len(_normalized_cache) > _NORMALIZED_CACHE_SIZE:
+            _normalized_cache.popitem(last=False)
 
 
 def normalize(
@@ -131,6 +297,9 @@ def normalize(
     min_sample_size: int = 1024 * 1024,
     percentage_sample_size: float = 0.1,
     max_sample_size: int | None = None,
+    write_buffer_size: int = 256 * 1024,
+    source_encoding: str | None = None,
+    source_newlines: Literal["LF", "CRLF", "CR"] | None = None,
 ):
     """
     Normalize a file by converting its encoding and newline style in-place.
@@ -139,6 +308,9 @@ def normalize(
     for very large files (10GB+) with constant memory usage. The file is modified
     in-place using a temporary file and atomic rename.
 
+    The GIL is released during the conversion, so it is safe to call from several
+    threads at once to normalize different files in parallel.
+
     Args:
         file_path: Path to the input file (string or Path object)
         encoding: Target encoding name (e.g., 'utf-8', 'utf-16', 'latin-1'). Default: 'utf-8'
@@ -146,11 +318,18 @@ def normalize(
         min_sample_size: Minimum number of bytes to sample. Default is 1MB.
         percentage_sample_size: Percentage of file to sample (0.0 to 1.0). Default is 0.1 (10%).
         max_sample_size: Optional maximum number of bytes to sample. Default is None.
+        write_buffer_size: Size in bytes of the output write buffer. Default is 256KB.
+                          Larger buffers mean fewer write syscalls on large files.
+        source_encoding: Optional known encoding of the input file. Default is None (detect it).
+                        When given, encoding detection is skipped and the file is converted directly.
+        source_newlines: Optional known newline style of the input file. Default is None (detect it).
+                        When both source values are given and already match the target, the
+                        file is left untouched without being read. The caller vouches for them.
 
     Raises:
         IOError: If file cannot be read or written
         ValueError: If encoding conversion fails or invalid newlines value
-        LookupError: If target encoding is invalid
+        LookupError: If target encoding or source_encoding is invalid
 
     Examples:
         >>> import charsetrs
@@ -163,64 +342,81 @@ def normalize(
         >>> charsetrs.normalize("large.txt", encoding="utf-8", newlines="LF",
         ...                    min_sample_size=2*1024*1024,
         ...                    percentage_sample_size=0.05)
+
+        >>> # Skip detection entirely when the input format is already known
+        >>> charsetrs.normalize("file.txt", encoding="utf-8", newlines="LF",
+        ...                    source_encoding="utf-8", source_newlines="LF")
     """
-    # Validate inputs
-    if isinstance(file_path, str):
-        file_path = Path(file_path)
+    if newlines not in _VALID_NEWLINES:
+        raise ValueError(f"Invalid newlines value {newlines!r}. Must be 'LF', 'CRLF', or 'CR'")
 
-    file_path = file_path.absolute()
-    if file_path.is_dir():
-        raise ValueError(f"Provided path '{file_path}' is a directory, expected a file path.")
+    if not _is_encoding_supported_internal(encoding):
+        raise LookupError(f"Unsupported target encoding: {encoding}")
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"File '{file_path}' does not exist.")
+    if source_encoding is not None and not _is_encoding_supported_internal(source_encoding):
+        raise LookupError(f"Unsupported source encoding: {source_encoding}")
 
-    # Check if normalization is needed
-    result = analyse(file_path, min_sample_size, percentage_sample_size, max_sample_size)
+    # Trust the caller's description of the file and skip all I/O if nothing would change
+    if (
+        source_encoding is not None
+        and source_newlines == newlines
+        and _encodings_are_equivalent(source_encoding, encoding)
+    ):
+        return
 
-    # Check if encodings are equivalent and newlines match
-    if _encodings_are_equivalent(result.encoding, encoding) and result.newlines == newlines:
-        # No normalization needed
+    # A single stat rejects missing files and identifies this version of the file, so a file
+    # that is already known to be in the target format is not read again
+    file_path = os.fspath(file_path)
+    stat_result = os.stat(file_path)
+    cache_key = _normalized_cache_key(file_path, stat_result, encoding, newlines)
+    if _is_known_normalized(cache_key):
         return
 
+    if source_encoding is None:
+        # Check if normalization is needed (Rust rejects directories)
+        result = _analyse_cached(
+            file_path,
+            stat_result.st_dev,
+            stat_result.st_ino,
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+            min_sample_size,
+            percentage_sample_size,
+            max_sample_size,
+        )
+
+        # Check if encodings are equivalent and newlines match
+        if _encodings_are_equivalent(result.encoding, encoding) and result.newlines == newlines:
+            # No normalization needed
+            _remember_normalized(cache_key)
+            return
+
+        source_encoding = result.encoding
+
     # Create temporary output file in the same directory for atomic rename
-    temp_output = file_path.parent / f".{file_path.name}.tmp"
+    directory, name = os.path.split(file_path)
+    temp_output = os.path.join(directory, f".{name}.tmp")
 
     try:
-        # Call Rust streaming normalize function
-        try:
-            _normalize_file_stream_internal(
-                file_path.as_posix(),
-                temp_output.as_posix(),
-                encoding,
-                newlines,
-                min_sample_size,
-                percentage_sample_size,
-                max_sample_size,
-            )
-        except OSError as e:
-            # Convert OSError from Rust to ValueError for invalid newlines
-            error_msg = str(e)
-            if "Invalid newlines value" in error_msg:
-                raise ValueError(error_msg) from e
-            raise
-
-        # Create backup of original file
-        backup_path = file_path.with_suffix(file_path.suffix + ".bak")
-        file_path.rename(backup_path)
-
-        try:
-            # Atomically replace original with normalized version
-            temp_output.rename(file_path)
-            # Remove backup if successful
-            backup_path.unlink()
-        except Exception:
-            # Restore original file if rename failed
-            backup_path.rename(file_path)
-            raise
-
+        # Call Rust streaming normalize function with the known or detected source
+        # encoding so the file is never sampled inside Rust. Rust writes the temporary file
+        # and renames it over the original in a single atomic step.
+        _normalize_file_stream_internal(
+            file_path,
+            temp_output,
+            encoding,
+            newlines,
+            min_sample_size,
+            percentage_sample_size,
+            max_sample_size,
+            write_buffer_size,
+            source_encoding,
+        )
     except Exception:
         # Clean up temporary file if it exists
-        if temp_output.exists():
-            temp_output.unlink()
+        with suppress(FileNotFoundError):
+            os.unlink(temp_output)
         raise
+
+    # The rewritten file is now in the target format; remember its new identity
+    _remember_normalized(_normalized_cache_key(file_path, os.stat(file_path), encoding, newlines))
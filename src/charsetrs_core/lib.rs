@@ -1,11 +1,13 @@
-use pyo3::exceptions::PyIOError;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::{PyFileNotFoundError, PyIOError, PyLookupError, PyValueError};
 use pyo3::prelude::*;
 use std::fs::File;
-use std::io::{BufReader, BufWriter, Read, Seek, SeekFrom, Write};
+use std::io::{BufRead, BufReader, BufWriter, ErrorKind, Write};
 use std::path::Path;
 
 // Constants for memory control
 const CHUNK_SIZE: usize = 8192; // 8KB per chunk
+const IO_BUFFER_SIZE: usize = 256 * 1024; // 256KB read/write buffers for streaming normalize
 
 // Sampling distribution percentages
 const HEAD_PERCENTAGE: f64 = 0.35; // 35% from beginning
@@ -47,23 +49,17 @@ fn normalize_encoding_name(encoding: &str) -> String {
     }
 }
 
-/// AnalysisResult represents the result of file analysis with encoding and newline style
-#[pyclass]
-#[derive(Clone)]
+/// AnalysisResult represents the result of file analysis with encoding and newline style.
+/// It is handed to Python as a plain `(encoding, newlines)` tuple, and the Python package
+/// builds its own `AnalysisResult` dataclass from it.
 struct AnalysisResult {
-    #[pyo3(get)]
     encoding: String,
-    #[pyo3(get)]
-    newlines: String,
+    newlines: &'static str,
 }
 
-#[pymethods]
 impl AnalysisResult {
-    fn __repr__(&self) -> PyResult<String> {
-        Ok(format!(
-            "AnalysisResult(encoding='{}', newlines='{}')",
-            self.encoding, self.newlines
-        ))
+    fn into_tuple(self) -> (String, &'static str) {
+        (self.encoding, self.newlines)
     }
 }
 
@@ -279,18 +275,47 @@ fn calculate_sample_size(
 }
 
 /// Read strategic samples from file without loading entire file into memory
-/// Returns a buffer containing samples from head, tail, and middle sections
+/// Returns a buffer containing samples from head, tail, and middle sections, along with
+/// the number of bytes taken from each region
 fn read_strategic_sample(
-    reader: &mut BufReader<File>,
+    file: &File,
     file_size: u64,
     sample_size: usize,
-) -> std::io::Result<Vec<u8>> {
-    let mut buffer = Vec::new();
+) -> std::io::Result<(Vec<u8>, Vec<usize>)> {
+    let regions = sample_regions(file_size, sample_size);
+
+    // Allocate the whole sample up front so the regions are read straight into it
+    let mut buffer = Vec::with_capacity(regions.iter().map(|&(_, len)| len).sum());
+    let mut region_lengths = Vec::with_capacity(regions.len());
+    for (offset, len) in regions {
+        region_lengths.push(read_region(file, offset, len, &mut buffer)?);
+    }
+
+    Ok((buffer, region_lengths))
+}
+
+/// Copy the same strategic samples as `read_strategic_sample` out of in-memory data
+fn sample_bytes(data: &[u8], sample_size: usize) -> (Vec<u8>, Vec<usize>) {
+    let regions = sample_regions(data.len() as u64, sample_size);
+
+    let mut buffer = Vec::with_capacity(regions.iter().map(|&(_, len)| len).sum());
+    let mut region_lengths = Vec::with_capacity(regions.len());
+    for (offset, len) in regions {
+        let start = offset as usize;
+        let region = &data[start..(start + len).min(data.len())];
+        buffer.extend_from_slice(region);
+        region_lengths.push(region.len());
+    }
+
+    (buffer, region_lengths)
+}
 
+/// Compute the (offset, length) regions to sample, in file order:
+/// head, middle chunks distributed uniformly, then tail
+fn sample_regions(file_size: u64, sample_size: usize) -> Vec<(u64, usize)> {
     // For very small files or when sample >= file size, read entire file
     if sample_size >= file_size as usize {
-        reader.read_to_end(&mut buffer)?;
-        return Ok(buffer);
+        return vec![(0, file_size as usize)];
     }
 
     // Calculate section sizes
@@ -302,18 +327,17 @@ fn read_strategic_sample(
     let middle_chunk_size = (sample_size as f64 * MIDDLE_CHUNK_PERCENTAGE) as usize;
     let num_middle_chunks = (middle_total_size as f64 / middle_chunk_size as f64).ceil() as usize;
 
-    // Read head section (35% from beginning)
-    let mut head_buffer = vec![0u8; head_size];
-    reader.seek(SeekFrom::Start(0))?;
-    let head_read = reader.read(&mut head_buffer)?;
-    buffer.extend_from_slice(&head_buffer[..head_read]);
+    let mut regions = Vec::with_capacity(num_middle_chunks + 2);
+
+    // Head section (35% from beginning)
+    regions.push((0, head_size));
 
     // Calculate middle section boundaries (between head and tail)
     let middle_start = head_size as u64;
     let middle_end = file_size.saturating_sub(tail_size as u64);
     let middle_length = middle_end.saturating_sub(middle_start);
 
-    // Read middle chunks distributed uniformly
+    // Middle chunks distributed uniformly
     if middle_length > 0 && num_middle_chunks > 0 {
         for i in 0..num_middle_chunks {
             // Calculate position for this chunk, distributed uniformly using floating-point arithmetic
@@ -326,42 +350,205 @@ fn read_strategic_sample(
                 middle_chunk_size.min((middle_end.saturating_sub(chunk_position)) as usize);
 
             if bytes_to_read > 0 {
-                let mut chunk_buffer = vec![0u8; bytes_to_read];
-                reader.seek(SeekFrom::Start(chunk_position))?;
-                let chunk_read = reader.read(&mut chunk_buffer)?;
-                buffer.extend_from_slice(&chunk_buffer[..chunk_read]);
+                regions.push((chunk_position, bytes_to_read));
             }
         }
     }
 
-    // Read tail section (15% from end)
+    // Tail section (15% from end)
     let tail_start = file_size.saturating_sub(tail_size as u64);
-    let mut tail_buffer = vec![0u8; tail_size];
-    reader.seek(SeekFrom::Start(tail_start))?;
-    let tail_read = reader.read(&mut tail_buffer)?;
-    buffer.extend_from_slice(&tail_buffer[..tail_read]);
+    regions.push((tail_start, tail_size));
+
+    regions
+}
+
+/// Append up to `len` bytes read at `offset` to `buffer` and return how many were read.
+/// Uses positional reads (pread on Unix), so sampled regions need no seek in between.
+fn read_region(
+    file: &File,
+    offset: u64,
+    len: usize,
+    buffer: &mut Vec<u8>,
+) -> std::io::Result<usize> {
+    let start = buffer.len();
+    buffer.resize(start + len, 0);
+
+    let mut filled = 0;
+    while filled < len {
+        match read_at(file, &mut buffer[start + filled..], offset + filled as u64) {
+            Ok(0) => break,
+            Ok(n) => filled += n,
+            Err(e) if e.kind() == ErrorKind::Interrupted => continue,
+            Err(e) => return Err(e),
+        }
+    }
+
+    buffer.truncate(start + filled);
+    Ok(filled)
+}
+
+#[cfg(unix)]
+fn read_at(file: &File, buf: &mut [u8], offset: u64) -> std::io::Result<usize> {
+    use std::os::unix::fs::FileExt;
+    file.read_at(buf, offset)
+}
+
+#[cfg(windows)]
+fn read_at(file: &File, buf: &mut [u8], offset: u64) -> std::io::Result<usize> {
+    use std::os::windows::fs::FileExt;
+    file.seek_read(buf, offset)
+}
+
+/// Open a file for reading and return it with its size.
+/// Missing files raise FileNotFoundError and directories raise ValueError, so callers
+/// don't need to stat the path beforehand.
+fn open_input_file(file_path: &str) -> PyResult<(File, u64)> {
+    let path = Path::new(file_path);
+    let directory_error = || {
+        PyValueError::new_err(format!(
+            "Provided path '{}' is a directory, expected a file path.",
+            file_path
+        ))
+    };
+
+    let file = match File::open(path) {
+        Ok(file) => file,
+        // Windows refuses to open directories, so only stat on the error path
+        Err(_) if path.is_dir() => return Err(directory_error()),
+        Err(e) if e.kind() == ErrorKind::NotFound => {
+            return Err(PyFileNotFoundError::new_err(format!(
+                "File '{}' does not exist.",
+                file_path
+            )))
+        }
+        Err(e) => return Err(PyIOError::new_err(format!("Failed to open file: {}", e))),
+    };
+
+    // Get file size
+    let metadata = file
+        .metadata()
+        .map_err(|e| PyIOError::new_err(format!("Failed to get file metadata: {}", e)))?;
+    if metadata.is_dir() {
+        return Err(directory_error());
+    }
 
-    Ok(buffer)
+    Ok((file, metadata.len()))
 }
 
+// Hint the kernel that a file will be read front to back so it reads ahead more aggressively
+#[cfg(target_os = "linux")]
+fn advise_sequential(file: &File) {
+    use std::os::unix::io::AsRawFd;
+
+    // Purely advisory: on failure the kernel just keeps its default read-ahead
+    unsafe {
+        libc::posix_fadvise(file.as_raw_fd(), 0, 0, libc::POSIX_FADV_SEQUENTIAL);
+    }
+}
+
+#[cfg(not(target_os = "linux"))]
+fn advise_sequential(_file: &File) {}
+
 /// Analyzes encoding and newline style from a file using streaming
+///
+/// The GIL is released while the file is read and scored, so several files can be
+/// analysed in parallel from Python threads.
 #[pyfunction]
 #[pyo3(signature = (file_path, min_sample_size=1024*1024, percentage_sample_size=0.1, max_sample_size=None))]
 fn analyse_from_path_stream(
+    py: Python<'_>,
     file_path: String,
     min_sample_size: usize,
     percentage_sample_size: f64,
     max_sample_size: Option<usize>,
-) -> PyResult<AnalysisResult> {
-    let path = Path::new(&file_path);
-    let file =
-        File::open(path).map_err(|e| PyIOError::new_err(format!("Failed to open file: {}", e)))?;
+) -> PyResult<(String, &'static str)> {
+    py.detach(|| {
+        analyse_file(
+            &file_path,
+            min_sample_size,
+            percentage_sample_size,
+            max_sample_size,
+        )
+    })
+    .map(AnalysisResult::into_tuple)
+}
 
-    // Get file size
-    let metadata = file
-        .metadata()
-        .map_err(|e| PyIOError::new_err(format!("Failed to get file metadata: {}", e)))?;
-    let file_size = metadata.len();
+/// Analyzes several files in a single call, returning (encoding, newlines) pairs in input order
+///
+/// Crossing the Python/Rust boundary once for the whole batch avoids the per-call overhead
+/// of analysing many small files one by one. The GIL is released for the whole batch.
+#[pyfunction]
+#[pyo3(signature = (file_paths, min_sample_size=1024*1024, percentage_sample_size=0.1, max_sample_size=None))]
+fn analyse_many_from_paths_stream(
+    py: Python<'_>,
+    file_paths: Vec<String>,
+    min_sample_size: usize,
+    percentage_sample_size: f64,
+    max_sample_size: Option<usize>,
+) -> PyResult<Vec<(String, &'static str)>> {
+    py.detach(|| {
+        file_paths
+            .iter()
+            .map(|file_path| {
+                analyse_file(
+                    file_path,
+                    min_sample_size,
+                    percentage_sample_size,
+                    max_sample_size,
+                )
+                .map(AnalysisResult::into_tuple)
+            })
+            .collect()
+    })
+}
+
+/// Analyzes encoding and newline style of in-memory data (bytes, bytearray, memoryview, ...)
+///
+/// The data is read through the buffer protocol, so only the sampled regions are copied.
+/// Detection then runs with the GIL released, like the file-based analysis.
+#[pyfunction]
+#[pyo3(signature = (data, min_sample_size=1024*1024, percentage_sample_size=0.1, max_sample_size=None))]
+fn analyse_from_bytes(
+    py: Python<'_>,
+    data: PyBuffer<u8>,
+    min_sample_size: usize,
+    percentage_sample_size: f64,
+    max_sample_size: Option<usize>,
+) -> PyResult<(String, &'static str)> {
+    if data.item_count() == 0 {
+        return Err(PyValueError::new_err("Data is empty"));
+    }
+
+    let sample_size = calculate_sample_size(
+        data.item_count() as u64,
+        min_sample_size,
+        percentage_sample_size,
+        max_sample_size,
+    );
+
+    let (sample, region_lengths) = if data.is_c_contiguous() {
+        // SAFETY: the buffer is contiguous, non-empty and stays exported while `data` is
+        // alive; it is only read here, with the GIL held
+        let bytes =
+            unsafe { std::slice::from_raw_parts(data.buf_ptr() as *const u8, data.item_count()) };
+        sample_bytes(bytes, sample_size)
+    } else {
+        sample_bytes(&data.to_vec(py)?, sample_size)
+    };
+
+    Ok(py
+        .detach(|| detect_from_sample(&sample, &region_lengths))
+        .into_tuple())
+}
+
+// Analyse a file without touching the Python interpreter (safe to run with the GIL released)
+fn analyse_file(
+    file_path: &str,
+    min_sample_size: usize,
+    percentage_sample_size: f64,
+    max_sample_size: Option<usize>,
+) -> PyResult<AnalysisResult> {
+    let (file, file_size) = open_input_file(file_path)?;
 
     if file_size == 0 {
         return Err(PyIOError::new_err("File is empty"));
@@ -375,18 +562,55 @@ fn analyse_from_path_stream(
         max_sample_size,
     );
 
-    let mut reader = BufReader::new(file);
-
     // Read strategic sample from file
-    let buffer = read_strategic_sample(&mut reader, file_size, sample_size)
+    let (buffer, region_lengths) = read_strategic_sample(&file, file_size, sample_size)
         .map_err(|e| PyIOError::new_err(format!("Failed to read file: {}", e)))?;
 
     if buffer.is_empty() {
         return Err(PyIOError::new_err("Failed to read any data from file"));
     }
 
+    Ok(detect_from_sample(&buffer, &region_lengths))
+}
+
+/// Check that each sampled region is valid UTF-8 on its own. Regions cut out of the source
+/// may start or end partway through a multi-byte character, so at those cuts up to 3
+/// leading continuation bytes and an incomplete final character are allowed.
+fn sample_is_utf8(buffer: &[u8], region_lengths: &[usize]) -> bool {
+    let last = region_lengths.len().saturating_sub(1);
+    let mut start = 0;
+
+    for (i, &len) in region_lengths.iter().enumerate() {
+        let mut region = &buffer[start..start + len];
+        start += len;
+
+        // Every region but the head starts at a cut
+        if i > 0 {
+            let continuation_bytes = region
+                .iter()
+                .take(3)
+                .take_while(|&&byte| byte & 0xC0 == 0x80)
+                .count();
+            region = &region[continuation_bytes..];
+        }
+
+        match std::str::from_utf8(region) {
+            Ok(_) => {}
+            // error_len() is None only when the input ends inside an otherwise valid
+            // character, which every region but the tail may do at its cut
+            Err(e) if i < last && e.error_len().is_none() => {}
+            Err(_) => return false,
+        }
+    }
+
+    true
+}
+
+// Detect encoding and newline style from a non-empty sample (pure CPU, no I/O).
+// `region_lengths` gives the size of each sampled region joined into `buffer`, in order.
+fn detect_from_sample(buffer: &[u8], region_lengths: &[usize]) -> AnalysisResult {
     // Detect newline style
-    let newlines = detect_newline_style(&buffer);
+    let newlines = detect_newline_style(buffer);
 
     // Detect encoding (reuse existing logic)
     let (encoding_str, skip_bytes) = if buffer.starts_with(&[0xEF, 0xBB, 0xBF]) {
@@ -399,11 +623,17 @@ fn analyse_from_path_stream(
         ("UTF-32LE", 4)
     } else if buffer.starts_with(&[0x00, 0x00, 0xFE, 0xFF]) {
         ("UTF-32BE", 4)
-    } else if let Some(utf16_encoding) = detect_utf16_pattern(&buffer) {
+    } else if let Some(utf16_encoding) = detect_utf16_pattern(buffer) {
         (utf16_encoding, 0)
+    } else if sample_is_utf8(buffer, region_lengths) {
+        // Fast path: pure ASCII and valid UTF-8 samples need no candidate scoring
+        return AnalysisResult {
+            encoding: "utf_8".to_string(),
+            newlines,
+        };
     } else {
-        let byte_hints = analyze_byte_patterns(&buffer);
-        let result = chardet::detect(&buffer);
+        let byte_hints = analyze_byte_patterns(buffer);
+        let result = chardet::detect(buffer);
         let detected = result.0.to_lowercase().replace("-", "_");
 
         let encoding = match detected.as_str() {
@@ -444,7 +674,7 @@ fn analyse_from_path_stream(
     let buffer_slice = &buffer[skip_bytes..];
     let mut encodings_to_try = vec![encoding_str];
 
-    let byte_hints = analyze_byte_patterns(&buffer);
+    let byte_hints = analyze_byte_patterns(buffer);
 
     for enc in &[
         "UTF-8",
@@ -550,10 +780,10 @@ fn analyse_from_path_stream(
 
     let normalized_encoding = normalize_encoding_name(&final_encoding);
 
-    Ok(AnalysisResult {
+    AnalysisResult {
         encoding: normalized_encoding,
-        newlines: newlines.to_string(),
-    })
+        newlines,
+    }
 }
 
 // Helper function to get encoding_rs::Encoding from encoding name
@@ -561,6 +791,14 @@ fn analyse_from_path_stream(
 // This is separate from normalize_encoding_name which converts TO Python-compatible names.
 // Here we convert FROM user input TO encoding_rs labels (e.g., "utf-8", "windows-1252").
 fn get_encoding_rs(encoding_name: &str) -> Option<&'static encoding_rs::Encoding> {
+    // Most user-facing names ("utf-8", "windows-1252", "Shift_JIS", ...) are already WHATWG
+    // labels, so resolve them directly before building a normalized copy of the name
+    if let Some(encoding) =
+        encoding_rs::Encoding::for_label_no_replacement(encoding_name.as_bytes())
+    {
+        return Some(encoding);
+    }
+
     let normalized = encoding_name.to_lowercase().replace("-", "_");
 
     let label = match normalized.as_str() {
@@ -590,16 +828,29 @@ fn get_encoding_rs(encoding_name: &str) -> Option<&'static encoding_rs::Encoding
         other => other,
     };
 
-    encoding_rs::Encoding::for_label(label.as_bytes())
+    // Labels such as "replacement" or "csiso2022kr" map to the REPLACEMENT encoding, which
+    // decodes any input to a single U+FFFD; treat them as unsupported like the lookup above
+    encoding_rs::Encoding::for_label_no_replacement(label.as_bytes())
+}
+
+/// Check whether an encoding name can be used as a normalize target (a table lookup, no I/O)
+#[pyfunction]
+fn is_encoding_supported(encoding: &str) -> bool {
+    get_encoding_rs(encoding).is_some()
 }
 
 /// Normalize a file by converting its encoding and newline style using streaming
 ///
 /// This function processes files in chunks to maintain constant memory usage,
 /// making it suitable for very large files (10GB+) on systems with limited RAM (512MB).
+/// The result is written to `output_path`, which is then renamed over `file_path`.
+/// When `source_encoding` is given, it is trusted and the file is not analysed again.
+/// The GIL is released for the whole conversion.
 #[pyfunction]
-#[pyo3(signature = (file_path, output_path, target_encoding="utf-8", target_newlines="LF", min_sample_size=1024*1024, percentage_sample_size=0.1, max_sample_size=None))]
+#[pyo3(signature = (file_path, output_path, target_encoding="utf-8", target_newlines="LF", min_sample_size=1024*1024, percentage_sample_size=0.1, max_sample_size=None, write_buffer_size=IO_BUFFER_SIZE, source_encoding=None))]
+#[allow(clippy::too_many_arguments)]
 fn normalize_file_stream(
+    py: Python<'_>,
     file_path: String,
     output_path: String,
     target_encoding: &str,
@@ -607,6 +858,36 @@ fn normalize_file_stream(
     min_sample_size: usize,
     percentage_sample_size: f64,
     max_sample_size: Option<usize>,
+    write_buffer_size: usize,
+    source_encoding: Option<&str>,
+) -> PyResult<()> {
+    py.detach(|| {
+        normalize_file(
+            &file_path,
+            &output_path,
+            target_encoding,
+            target_newlines,
+            min_sample_size,
+            percentage_sample_size,
+            max_sample_size,
+            write_buffer_size,
+            source_encoding,
+        )
+    })
+}
+
+// Normalize a file without touching the Python interpreter (safe to run with the GIL released)
+#[allow(clippy::too_many_arguments)]
+fn normalize_file(
+    file_path: &str,
+    output_path: &str,
+    target_encoding: &str,
+    target_newlines: &str,
+    min_sample_size: usize,
+    percentage_sample_size: f64,
+    max_sample_size: Option<usize>,
+    write_buffer_size: usize,
+    source_encoding: Option<&str>,
 ) -> PyResult<()> {
     // Validate target_newlines
     let newline_bytes: &[u8] = match target_newlines {
@@ -621,74 +902,131 @@ fn normalize_file_stream(
         }
     };
 
-    // First, analyse the file to detect source encoding
-    let analysis = analyse_from_path_stream(
-        file_path.clone(),
-        min_sample_size,
-        percentage_sample_size,
-        max_sample_size,
-    )?;
+    // Resolve the target first so an unknown name fails before any file is read
+    let target_encoding_rs = get_encoding_rs(target_encoding).ok_or_else(|| {
+        PyLookupError::new_err(format!("Unsupported target encoding: {}", target_encoding))
+    })?;
 
-    // Get source and target encodings
-    let source_encoding = get_encoding_rs(&analysis.encoding).ok_or_else(|| {
+    // Reuse the caller's detection when given, otherwise analyse the file to detect it
+    let detected_encoding = match source_encoding {
+        Some(encoding) => encoding.to_string(),
+        None => {
+            analyse_file(
+                file_path,
+                min_sample_size,
+                percentage_sample_size,
+                max_sample_size,
+            )?
+            .encoding
+        }
+    };
+
+    // Get source encoding
+    let source_encoding = get_encoding_rs(&detected_encoding).ok_or_else(|| {
         PyIOError::new_err(format!(
             "Unsupported source encoding: {}",
-            analysis.encoding
+            detected_encoding
         ))
     })?;
 
-    let target_encoding_rs = get_encoding_rs(target_encoding).ok_or_else(|| {
-        PyIOError::new_err(format!("Unsupported target encoding: {}", target_encoding))
-    })?;
-
     // Open input and output files
-    let input_path = Path::new(&file_path);
-    let output_path_obj = Path::new(&output_path);
+    let output_path_obj = Path::new(output_path);
 
-    let input_file = File::open(input_path)
-        .map_err(|e| PyIOError::new_err(format!("Failed to open input file: {}", e)))?;
+    let (input_file, _) = open_input_file(file_path)?;
+    advise_sequential(&input_file);
     let output_file = File::create(output_path_obj)
         .map_err(|e| PyIOError::new_err(format!("Failed to create output file: {}", e)))?;
 
-    let mut reader = BufReader::new(input_file);
-    let mut writer = BufWriter::new(output_file);
+    // Large buffers collapse the per-chunk read()/write() calls into a few syscalls
+    let mut reader = BufReader::with_capacity(IO_BUFFER_SIZE, input_file);
+    let mut writer = BufWriter::with_capacity(write_buffer_size.max(1), output_file);
+
+    // With the same ASCII-compatible encoding on both sides only the newlines change, so the
+    // raw bytes skip decoding and re-encoding. A BOM for another encoding would switch the
+    // decoder to that encoding, so such files still go through the transcoding path.
+    let bom = encoding_rs::Encoding::for_bom(
+        reader
+            .fill_buf()
+            .map_err(|e| PyIOError::new_err(format!("Failed to read from input file: {}", e)))?,
+    );
+    let passthrough = source_encoding == target_encoding_rs
+        && source_encoding.is_ascii_compatible()
+        && bom.map_or(true, |(bom_encoding, _)| bom_encoding == source_encoding);
+
+    if passthrough {
+        // Drop the BOM, matching what the decoder does on the transcoding path
+        if let Some((_, bom_length)) = bom {
+            reader.consume(bom_length);
+        }
+        copy_with_newlines(&mut reader, &mut writer, newline_bytes)?;
+    } else {
+        transcode_with_newlines(
+            &mut reader,
+            &mut writer,
+            source_encoding,
+            target_encoding_rs,
+            newline_bytes,
+        )?;
+    }
+
+    // Flush the writer and close both files so the output can be moved into place
+    let output_file = writer
+        .into_inner()
+        .map_err(|e| PyIOError::new_err(format!("Failed to flush output: {}", e.error())))?;
+    drop(output_file);
+    drop(reader);
+
+    // Atomically replace the original file with the normalized output in a single rename
+    std::fs::rename(output_path_obj, file_path)
+        .map_err(|e| PyIOError::new_err(format!("Failed to replace original file: {}", e)))?;
+
+    Ok(())
+}
 
+// Stream the input through a decoder and encoder, converting newlines on the way
+fn transcode_with_newlines(
+    reader: &mut BufReader<File>,
+    writer: &mut BufWriter<File>,
+    source_encoding: &'static encoding_rs::Encoding,
+    target_encoding: &'static encoding_rs::Encoding,
+    newline_bytes: &[u8],
+) -> PyResult<()> {
     // Create decoder and encoder
     let mut decoder = source_encoding.new_decoder();
-    let mut encoder = target_encoding_rs.new_encoder();
+    let mut encoder = target_encoding.new_encoder();
 
-    // Buffers for streaming processing
-    let mut input_buffer = vec![0u8; CHUNK_SIZE];
-    let mut decode_buffer = String::with_capacity(CHUNK_SIZE * 2);
+    // Working buffers, allocated once and reused for every chunk
+    let mut decode_buffer = String::with_capacity(CHUNK_SIZE * 4);
+    let mut translated = Vec::with_capacity(CHUNK_SIZE * 4);
     let mut encode_buffer = vec![0u8; CHUNK_SIZE * 4]; // Larger to accommodate multi-byte encodings
 
     // State for newline conversion
     let mut pending_cr = false; // Track if previous chunk ended with CR
 
     loop {
-        // Read chunk from input
-        let bytes_read = reader
-            .read(&mut input_buffer)
+        // Decode straight out of the reader's buffer rather than copying into a chunk first
+        let input = reader
+            .fill_buf()
             .map_err(|e| PyIOError::new_err(format!("Failed to read from input file: {}", e)))?;
+        let at_eof = input.is_empty();
 
-        let is_last = bytes_read == 0;
-
-        // Decode chunk
         decode_buffer.clear();
-        let (result, _bytes_read, _had_errors) =
-            decoder.decode_to_string(&input_buffer[..bytes_read], &mut decode_buffer, is_last);
+        let (result, bytes_read, _had_errors) =
+            decoder.decode_to_string(input, &mut decode_buffer, at_eof);
+        reader.consume(bytes_read);
 
-        if result == encoding_rs::CoderResult::OutputFull {
-            return Err(PyIOError::new_err("Decode buffer too small"));
-        }
+        // A full decode buffer is not an error: the remaining input is decoded on the next pass
+        let is_last = at_eof && result == encoding_rs::CoderResult::InputEmpty;
 
-        // Process and write decoded chunk with newline conversion
-        if !decode_buffer.is_empty() {
+        // Process and write decoded chunk with newline conversion; the last call also
+        // flushes a trailing CR held over from the previous chunk
+        if !decode_buffer.is_empty() || is_last {
             process_and_write_chunk(
                 &decode_buffer,
                 &mut encoder,
+                &mut translated,
                 &mut encode_buffer,
-                &mut writer,
+                writer,
                 newline_bytes,
                 &mut pending_cr,
                 is_last,
@@ -700,10 +1038,44 @@ fn normalize_file_stream(
         }
     }
 
-    // Flush the writer
-    writer
-        .flush()
-        .map_err(|e| PyIOError::new_err(format!("Failed to flush output: {}", e)))?;
+    Ok(())
+}
+
+// Copy raw bytes from input to output, converting only the newlines.
+// Works on the reader's own buffer, so the bytes are not copied into an intermediate chunk.
+fn copy_with_newlines(
+    reader: &mut BufReader<File>,
+    writer: &mut BufWriter<File>,
+    newline_bytes: &[u8],
+) -> PyResult<()> {
+    let mut translated = Vec::with_capacity(IO_BUFFER_SIZE);
+    let mut pending_cr = false;
+
+    loop {
+        let chunk = reader
+            .fill_buf()
+            .map_err(|e| PyIOError::new_err(format!("Failed to read from input file: {}", e)))?;
+        let chunk_length = chunk.len();
+        let is_last = chunk_length == 0;
+
+        translated.clear();
+        translate_newlines(
+            chunk,
+            newline_bytes,
+            &mut pending_cr,
+            is_last,
+            &mut translated,
+        );
+        reader.consume(chunk_length);
+
+        writer
+            .write_all(&translated)
+            .map_err(|e| PyIOError::new_err(format!("Failed to write to output: {}", e)))?;
+
+        if is_last {
+            break;
+        }
+    }
 
     Ok(())
 }
@@ -712,67 +1084,32 @@ fn normalize_file_stream(
 fn process_and_write_chunk(
     text: &str,
     encoder: &mut encoding_rs::Encoder,
+    translated: &mut Vec<u8>,
     encode_buffer: &mut Vec<u8>,
     writer: &mut BufWriter<File>,
     newline_bytes: &[u8],
     pending_cr: &mut bool,
     is_last: bool,
 ) -> PyResult<()> {
-    // Convert newline bytes to string once (safe because we validate newline_bytes is valid UTF-8)
-    let newline_str =
-        std::str::from_utf8(newline_bytes).expect("newline_bytes should always be valid UTF-8");
-
-    // Process text character by character to handle newlines
-    let mut output = String::with_capacity(text.len());
-    let chars: Vec<char> = text.chars().collect();
-
-    for (i, &ch) in chars.iter().enumerate() {
-        if *pending_cr {
-            // Previous chunk ended with CR
-            if ch == '\n' {
-                // This is CRLF split across chunks, output target newline
-                output.push_str(newline_str);
-                *pending_cr = false;
-                continue;
-            } else {
-                // Previous CR was standalone, output it and continue
-                output.push_str(newline_str);
-                *pending_cr = false;
-            }
-        }
-
-        match ch {
-            '\r' => {
-                // Check if next char is \n
-                if i + 1 < chars.len() && chars[i + 1] == '\n' {
-                    // CRLF - will handle \n in next iteration
-                    output.push_str(newline_str);
-                } else if i + 1 == chars.len() && !is_last {
-                    // CR at end of chunk, might be part of CRLF
-                    *pending_cr = true;
-                } else {
-                    // Standalone CR
-                    output.push_str(newline_str);
-                }
-            }
-            '\n' => {
-                // Check if this is part of CRLF (previous char was \r)
-                if i > 0 && chars[i - 1] == '\r' {
-                    // Already handled as CRLF, skip
-                    continue;
-                } else {
-                    // Standalone LF
-                    output.push_str(newline_str);
-                }
-            }
-            _ => {
-                output.push(ch);
-            }
-        }
-    }
+    // Convert newlines in a single pass over the chunk's bytes. With LF output, a chunk
+    // without any CR is already in the target style and is encoded as-is without a copy.
+    let output = if newline_bytes == b"\n" && !*pending_cr && !text.as_bytes().contains(&b'\r') {
+        text
+    } else {
+        translated.clear();
+        translate_newlines(
+            text.as_bytes(),
+            newline_bytes,
+            pending_cr,
+            is_last,
+            translated,
+        );
+        std::str::from_utf8(translated)
+            .expect("newline translation only splits text at ASCII bytes")
+    };
 
-    // Encode and write the processed text
-    if !output.is_empty() {
+    // Encode and write the processed text (on the last chunk, also flush the encoder state)
+    if !output.is_empty() || is_last {
         let mut start = 0;
         loop {
             let (result, bytes_read, bytes_written, _had_errors) =
@@ -796,11 +1133,70 @@ fn process_and_write_chunk(
     Ok(())
 }
 
+// Append `input` to `output` with every CRLF, CR and LF replaced by `newline`.
+// A CR at the very end of `input` is held back in `pending_cr` until the next chunk shows
+// whether it starts a CRLF pair; it is flushed once `is_last` is set.
+// Runs between newlines are copied in bulk, so this works on raw bytes of any
+// ASCII-compatible encoding as well as on UTF-8 text.
+fn translate_newlines(
+    input: &[u8],
+    newline: &[u8],
+    pending_cr: &mut bool,
+    is_last: bool,
+    output: &mut Vec<u8>,
+) {
+    let mut rest = input;
+
+    if *pending_cr && !rest.is_empty() {
+        // Previous chunk ended with CR: emit it, swallowing the LF if this is a split CRLF
+        output.extend_from_slice(newline);
+        *pending_cr = false;
+        if rest[0] == b'\n' {
+            rest = &rest[1..];
+        }
+    }
+
+    let mut run_start = 0;
+    let mut i = 0;
+    while i < rest.len() {
+        match rest[i] {
+            b'\r' => {
+                output.extend_from_slice(&rest[run_start..i]);
+                if i + 1 == rest.len() {
+                    // CR at end of chunk, might be part of CRLF
+                    *pending_cr = true;
+                    i += 1;
+                } else {
+                    output.extend_from_slice(newline);
+                    i += if rest[i + 1] == b'\n' { 2 } else { 1 };
+                }
+                run_start = i;
+            }
+            b'\n' => {
+                output.extend_from_slice(&rest[run_start..i]);
+                output.extend_from_slice(newline);
+                i += 1;
+                run_start = i;
+            }
+            _ => i += 1,
+        }
+    }
+    output.extend_from_slice(&rest[run_start..]);
+
+    if is_last && *pending_cr {
+        // Standalone CR at the very end of the input
+        output.extend_from_slice(newline);
+        *pending_cr = false;
+    }
+}
+
 /// A Python module implemented in Rust.
 #[pymodule]
 fn _internal(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(analyse_from_path_stream, m)?)?;
+    m.add_function(wrap_pyfunction!(analyse_many_from_paths_stream, m)?)?;
+    m.add_function(wrap_pyfunction!(analyse_from_bytes, m)?)?;
     m.add_function(wrap_pyfunction!(normalize_file_stream, m)?)?;
-    m.add_class::<AnalysisResult>()?;
+    m.add_function(wrap_pyfunction!(is_encoding_supported, m)?)?;
     Ok(())
 }
@@ -0,0 +1,35 @@
+"""
+Shared pytest fixtures for the charsetrs test suite
+"""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def repeated_text_file(tmp_path_factory):
+    """
+    Factory for read-only input files made of one line repeated `count` times.
+
+    Each distinct (line, count) pair is written once per session and the same path is
+    returned to every test that asks for it, so tests must not modify these files.
+    """
+    directory = tmp_path_factory.mktemp("repeated_text")
+    files: dict[tuple[bytes, int], Path] = {}
+
+    def make(line: bytes, count: int) -> Path:
+        key = (line, count)
+        if key not in files:
+            path = directory / f"repeated_{len(files)}.txt"
+            # Write 1024 lines at a time so large files never exist in memory as a whole
+            full_chunks, remaining_lines = divmod(count, 1024)
+            chunk = line * 1024
+            with open(path, "wb") as f:
+                for _ in range(full_chunks):
+                    f.write(chunk)
+                f.write(line * remaining_lines)
+            files[key] = path
+        return files[key]
+
+    return make
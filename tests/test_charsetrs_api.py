@@ -2,282 +2,433 @@
 Tests for the charsetrs API: analyse() and normalize()
 """
 
-import os
-import tempfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
 import charsetrs
 
-# Tests for charsetrs.analyse() function
-
+# Sample files shipped in tests/data, discovered once at import
+SAMPLE_FILES = sorted((Path(__file__).parent / "data").glob("*.txt"))
 
-def test_analyse_utf8_file():
-    """Test analysing UTF-8 encoded file with LF newlines"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Hello World!\nThis is UTF-8 text\n")
-        temp_path = f.name
-
-    try:
-        result = charsetrs.analyse(temp_path)
-        assert result is not None
-        assert isinstance(result, charsetrs.AnalysisResult)
-        assert result.encoding.upper() in [
-            "UTF-8",
-            "UTF8",
-            "UTF_8",
-        ], f"Expected UTF-8, got {result.encoding}"
-        assert result.newlines == "LF"
-    finally:
-        os.unlink(temp_path)
-
-
-def test_analyse_latin1_file():
-    """Test analysing Latin-1 encoded file"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        test_content = "Olá Mundo! Texto em português: ação, não, São Paulo\n"
-        f.write(test_content.encode("latin-1"))
-        temp_path = f.name
-
-    try:
-        result = charsetrs.analyse(temp_path)
-        assert result is not None
-        assert isinstance(result, charsetrs.AnalysisResult)
-        # Should analyse Latin-1 or Windows-1252 (which is compatible)
-        assert result.encoding.lower().replace("-", "_") in [
-            "iso_8859_1",
-            "windows_1252",
-            "latin_1",
-            "cp1252",
-        ], f"Expected Latin-1 compatible, got {result.encoding}"
-        assert result.newlines in ["LF", "CRLF", "CR"]
-    finally:
-        os.unlink(temp_path)
-
-
-def test_analyse_crlf_newlines():
-    """Test analysing file with CRLF newlines"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Line 1\r\nLine 2\r\nLine 3\r\n")
-        temp_path = f.name
+# Accepted spellings of detected encodings, after lowercasing and replacing "-" with "_"
+UTF8_NAMES = frozenset(("utf_8", "utf8"))
+# Latin-1 or Windows-1252 (which is compatible)
+LATIN1_NAMES = frozenset(("iso_8859_1", "windows_1252", "latin_1", "cp1252"))
+UTF16LE_NAMES = frozenset(("utf_16le",))
 
-    try:
-        result = charsetrs.analyse(temp_path)
-        assert result.newlines == "CRLF"
-    finally:
-        os.unlink(temp_path)
+NEWLINE_STYLES = frozenset(("LF", "CRLF", "CR"))
 
-
-def test_analyse_cr_newlines():
-    """Test analysing file with CR newlines"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Line 1\rLine 2\rLine 3\r")
-        temp_path = f.name
-
-    try:
-        result = charsetrs.analyse(temp_path)
-        assert result.newlines == "CR"
-    finally:
-        os.unlink(temp_path)
+# Tests for charsetrs.analyse() function
 
 
-def test_analyse_with_max_sample_size():
+@pytest.fixture(scope="module")
+def encoded_files(tmp_path_factory):
+    """Write the read-only inputs for the analyse() tests once per module, keyed by name"""
+    directory = tmp_path_factory.mktemp("encoded_files")
+    contents = {
+        "utf8_basic": b"Hello World!\nThis is UTF-8 text\n",
+        "latin1_basic": "Olá Mundo! Texto em português: ação, não, São Paulo\n".encode("latin-1"),
+        "utf16le_no_bom": ("Hello World, plain text line\n" * 20).encode("utf-16-le"),
+        # BOMs are prepended in one concatenation so each file is written in a single call
+        "utf8_bom": b"\xef\xbb\xbf" + "Olá Mundo!\n".encode(),
+        "utf16le_bom": b"\xff\xfe" + "Olá Mundo!\n".encode("utf-16-le"),
+        "crlf": b"Line 1\r\nLine 2\r\nLine 3\r\n",
+        "cr": b"Line 1\rLine 2\rLine 3\r",
+        "utf8_repetitive": ("Sample text\n" * 1000).encode("utf-8"),
+        "empty": b"",
+    }
+
+    files = {}
+    for name, content in contents.items():
+        files[name] = directory / f"{name}.txt"
+        files[name].write_bytes(content)
+    return files
+
+
+@pytest.mark.parametrize(
+    ("file_key", "expected_encodings", "expected_newlines"),
+    [
+        ("utf8_basic", UTF8_NAMES, "LF"),
+        ("latin1_basic", LATIN1_NAMES, None),
+        # BOM-less UTF-16LE must not be mistaken for UTF-8 (its bytes are valid UTF-8)
+        ("utf16le_no_bom", UTF16LE_NAMES, None),
+        ("utf8_bom", UTF8_NAMES, "LF"),
+        ("utf16le_bom", UTF16LE_NAMES, None),
+        ("crlf", None, "CRLF"),
+        ("cr", None, "CR"),
+    ],
+)
+def test_analyse_encoded_file(encoded_files, file_key, expected_encodings, expected_newlines):
+    """Test analysing files in various encodings and newline styles"""
+    result = charsetrs.analyse(str(encoded_files[file_key]))
+    assert isinstance(result, charsetrs.AnalysisResult)
+    assert result.newlines in NEWLINE_STYLES
+
+    if expected_encodings is not None:
+        encoding = result.encoding.lower().replace("-", "_")
+        assert encoding in expected_encodings, f"Expected one of {expected_encodings}, got {result.encoding}"
+    if expected_newlines is not None:
+        assert result.newlines == expected_newlines
+
+
+def test_analyse_with_max_sample_size(encoded_files):
     """Test analyse() with custom max_sample_size parameter"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        # Create a file with repetitive content
-        test_content = "Sample text\n" * 1000
-        f.write(test_content.encode("utf-8"))
-        temp_path = f.name
+    temp_path = str(encoded_files["utf8_repetitive"])
 
-    try:
-        # Test with small sample size (512 bytes)
-        result_small = charsetrs.analyse(temp_path, max_sample_size=512)
-        assert result_small is not None
+    # Test with small sample size (512 bytes)
+    result_small = charsetrs.analyse(temp_path, max_sample_size=512)
+    assert result_small is not None
 
-        # Test with larger sample size (2MB)
-        result_large = charsetrs.analyse(temp_path, max_sample_size=2 * 1024 * 1024)
-        assert result_large is not None
+    # Test with larger sample size (2MB)
+    result_large = charsetrs.analyse(temp_path, max_sample_size=2 * 1024 * 1024)
+    assert result_large is not None
 
-        # Both should analyse UTF-8
-        assert "UTF" in result_small.encoding.upper() or "8" in result_small.encoding
-        assert "UTF" in result_large.encoding.upper() or "8" in result_large.encoding
-    finally:
-        os.unlink(temp_path)
+    # Both should analyse UTF-8
+    assert result_small.encoding.lower().replace("-", "_") in UTF8_NAMES
+    assert result_large.encoding.lower().replace("-", "_") in UTF8_NAMES
 
 
 def test_analyse_nonexistent_file():
-    """Test that analyse() raises error for nonexistent file"""
-    with pytest.raises(Exception):
+    """Test that analyse() raises FileNotFoundError for nonexistent file"""
+    with pytest.raises(FileNotFoundError):
         charsetrs.analyse("/nonexistent/path/to/file.txt")
 
 
-def test_analyse_empty_file():
-    """Test analysing empty file raises appropriate error"""
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
-        temp_path = f.name
+def test_analyse_directory(tmp_path):
+    """Test that analyse() raises ValueError when given a directory"""
+    with pytest.raises(ValueError, match="directory"):
+        charsetrs.analyse(tmp_path)
 
-    try:
-        # Empty files should raise an error
-        with pytest.raises(Exception):
-            charsetrs.analyse(temp_path)
-    finally:
-        os.unlink(temp_path)
+
+def test_analyse_empty_file(encoded_files):
+    """Test analysing empty file raises appropriate error"""
+    # Empty files should raise an error
+    with pytest.raises(Exception):
+        charsetrs.analyse(str(encoded_files["empty"]))
 
 
-def test_analyse_with_path_object():
+def test_analyse_with_path_object(encoded_files):
     """Test that analyse() works with Path objects"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Test content\n")
-        temp_path = Path(f.name)
+    result = charsetrs.analyse(encoded_files["utf8_basic"])
+    assert result is not None
+    assert isinstance(result, charsetrs.AnalysisResult)
 
-    try:
-        result = charsetrs.analyse(temp_path)
-        assert result is not None
-        assert isinstance(result, charsetrs.AnalysisResult)
-    finally:
-        os.unlink(temp_path)
+
+def test_analyse_bytes_matches_analyse(encoded_files):
+    """Test that analyse_bytes() gives the same result as analyse() on the same content"""
+    for path in encoded_files.values():
+        content = path.read_bytes()
+        if content:
+            assert charsetrs.analyse_bytes(content) == charsetrs.analyse(path)
+
+
+def test_analyse_bytes_accepts_buffer_objects():
+    """Test that analyse_bytes() accepts bytearray and memoryview as well as bytes"""
+    content = "Olá Mundo! Texto em português: ação, não, São Paulo\r\n".encode("latin-1")
+    expected = charsetrs.analyse_bytes(content)
+
+    assert charsetrs.analyse_bytes(bytearray(content)) == expected
+    assert charsetrs.analyse_bytes(memoryview(content)) == expected
+    assert expected.newlines == "CRLF"
+
+
+def test_analyse_bytes_empty():
+    """Test that analyse_bytes() raises ValueError for empty data"""
+    with pytest.raises(ValueError):
+        charsetrs.analyse_bytes(b"")
+
+
+def test_analysis_result_uses_slots():
+    """Test that AnalysisResult instances carry no per-instance __dict__"""
+    result = charsetrs.AnalysisResult(encoding="utf_8", newlines="LF")
+    assert not hasattr(result, "__dict__")
+    with pytest.raises(AttributeError):
+        result.encoding = "cp1252"  # type: ignore[misc]
 
 
 # Tests for charsetrs.normalize() function
 
 
-def test_normalize_utf8_to_utf8_lf_to_lf():
+def test_normalize_utf8_to_utf8_lf_to_lf(tmp_path):
     """Test normalizing UTF-8 file with LF to UTF-8 with LF (identity)"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
+    temp_path = tmp_path / "input.txt"
+    with open(temp_path, "wb") as f:
         test_content = b"Hello World\nLine 2\nLine 3\n"
         f.write(test_content)
-        temp_path = f.name
 
-    try:
-        charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
 
-        # Verify output
-        with open(temp_path, "rb") as f:
-            output_content = f.read()
+    # Verify output
+    with open(temp_path, "rb") as f:
+        output_content = f.read()
 
-        assert output_content == test_content
-    finally:
-        os.unlink(temp_path)
+    assert output_content == test_content
 
 
-def test_normalize_lf_to_crlf():
+def test_normalize_lf_to_crlf(tmp_path):
     """Test normalizing LF newlines to CRLF"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Line 1\nLine 2\nLine 3\n")
-        temp_path = f.name
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\nLine 2\nLine 3\n")
 
-    try:
-        charsetrs.normalize(temp_path, encoding="utf-8", newlines="CRLF")
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="CRLF")
 
-        with open(temp_path, "rb") as f:
-            content = f.read()
+    with open(temp_path, "rb") as f:
+        content = f.read()
 
-        # Should have CRLF
-        assert b"\r\n" in content
-        assert content.count(b"\r\n") == 3
-        assert content == b"Line 1\r\nLine 2\r\nLine 3\r\n"
-    finally:
-        os.unlink(temp_path)
+    # Should have CRLF
+    assert b"\r\n" in content
+    assert content.count(b"\r\n") == 3
+    assert content == b"Line 1\r\nLine 2\r\nLine 3\r\n"
 
 
-def test_normalize_lf_to_cr():
+def test_normalize_lf_to_cr(tmp_path):
     """Test normalizing LF newlines to CR"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Line 1\nLine 2\nLine 3\n")
-        temp_path = f.name
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\nLine 2\nLine 3\n")
 
-    try:
-        charsetrs.normalize(temp_path, encoding="utf-8", newlines="CR")
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="CR")
 
-        with open(temp_path, "rb") as f:
-            content = f.read()
+    with open(temp_path, "rb") as f:
+        content = f.read()
 
-        # Should have CR but not CRLF
-        assert b"\r" in content
-        assert b"\r\n" not in content
-        assert content.count(b"\r") == 3
-        assert content == b"Line 1\rLine 2\rLine 3\r"
-    finally:
-        os.unlink(temp_path)
+    # Should have CR but not CRLF
+    assert b"\r" in content
+    assert b"\r\n" not in content
+    assert content.count(b"\r") == 3
+    assert content == b"Line 1\rLine 2\rLine 3\r"
 
 
-def test_normalize_crlf_to_lf():
+def test_normalize_crlf_to_lf(tmp_path):
     """Test normalizing CRLF newlines to LF"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Line 1\r\nLine 2\r\nLine 3\r\n")
-        temp_path = f.name
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\r\nLine 2\r\nLine 3\r\n")
 
-    try:
-        charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+
+    with open(temp_path, "rb") as f:
+        content = f.read()
 
-        with open(temp_path, "rb") as f:
-            content = f.read()
+    # Should have LF but not CR
+    assert b"\n" in content
+    assert b"\r" not in content
+    assert content == b"Line 1\nLine 2\nLine 3\n"
 
-        # Should have LF but not CR
-        assert b"\n" in content
-        assert b"\r" not in content
-        assert content == b"Line 1\nLine 2\nLine 3\n"
-    finally:
-        os.unlink(temp_path)
 
+def test_normalize_cr_to_lf_keeps_trailing_newline(tmp_path):
+    """Test normalizing CR newlines to LF, including a CR as the very last byte"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\rLine 2\rLine 3\r")
 
-def test_normalize_latin1_to_utf8():
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+
+    with open(temp_path, "rb") as f:
+        content = f.read()
+
+    assert content == b"Line 1\nLine 2\nLine 3\n"
+
+
+def test_normalize_same_encoding_only_converts_newlines(tmp_path):
+    """Test that normalizing to the detected encoding keeps every byte except the newlines"""
+    line = "Multi-byte text: café, São Paulo, 日本語\r\n"
+    temp_path = tmp_path / "input.txt"
+    with open(temp_path, "wb") as f:
+        # Large enough to span several read buffers, so CRLF pairs straddle chunk boundaries
+        f.write((line * 20000).encode("utf-8"))
+
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+
+    with open(temp_path, "rb") as f:
+        content = f.read()
+
+    assert content == (line.replace("\r\n", "\n") * 20000).encode("utf-8")
+
+
+def test_normalize_latin1_to_utf8(tmp_path):
     """Test normalizing Latin-1 file to UTF-8"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
+    temp_path = tmp_path / "input.txt"
+    with open(temp_path, "wb") as f:
         test_content = "Latin-1 text: café, São Paulo\n"
         f.write(test_content.encode("latin-1"))
-        temp_path = f.name
 
-    try:
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+
+    # Read output as UTF-8
+    with open(temp_path, encoding="utf-8") as f:
+        content = f.read()
+
+    assert "café" in content
+    assert "São Paulo" in content
+
+
+def test_normalize_leaves_no_temporary_files(tmp_path):
+    """Test that normalize() replaces the file without leaving backup or temp files behind"""
+    file_path = tmp_path / "input.txt"
+    file_path.write_bytes(b"Line 1\r\nLine 2\r\n")
+
+    charsetrs.normalize(file_path, encoding="utf-8", newlines="LF")
+
+    assert file_path.read_bytes() == b"Line 1\nLine 2\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["input.txt"]
+
+
+def test_normalize_drops_utf8_bom(tmp_path):
+    """Test that normalizing a UTF-8 file with a BOM to UTF-8 writes the text without the BOM"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"\xef\xbb\xbf" + "Olá\r\nMundo\r\n".encode())
+
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+
+    assert temp_path.read_bytes() == "Olá\nMundo\n".encode()
+
+
+def test_normalize_skips_io_when_source_matches_target(tmp_path):
+    """Test that normalize() returns without touching the file when the caller's source matches"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\r\nLine 2\r\n")
+
+    # The caller vouches for the source format, so the file is not read or rewritten
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF", source_encoding="utf8", source_newlines="LF")
+
+    with open(temp_path, "rb") as f:
+        assert f.read() == b"Line 1\r\nLine 2\r\n"
+
+
+def test_normalize_with_source_that_differs_from_target(tmp_path):
+    """Test that normalize() still converts when the caller's source differs from the target"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\r\nLine 2\r\n")
+
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF", source_encoding="utf-8", source_newlines="CRLF")
+
+    with open(temp_path, "rb") as f:
+        assert f.read() == b"Line 1\nLine 2\n"
+
+
+def test_normalize_with_source_encoding_skips_detection(tmp_path):
+    """Test that a caller-supplied source encoding is used for conversion instead of detection"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes("Olá\r\n".encode("latin-1"))
+
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF", source_encoding="latin-1")
+
+    with open(temp_path, "rb") as f:
+        assert f.read() == "Olá\n".encode()
+
+
+def test_normalize_text_that_grows_when_decoded(tmp_path):
+    """Test converting single-byte text whose UTF-8 form is up to three times larger"""
+    line = "€“”—…" * 10 + "\r\n"
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes((line * 5000).encode("cp1252"))
+
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF", source_encoding="windows-1252")
+
+    with open(temp_path, "rb") as f:
+        assert f.read() == (line.replace("\r\n", "\n") * 5000).encode("utf-8")
+
+
+def test_normalize_remembers_files_it_already_normalized(tmp_path, monkeypatch):
+    """Test that normalizing an unchanged, already normalized file again does not analyse it"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\r\nLine 2\r\n")
+
+    def fail_analyse(*args):
+        raise AssertionError("file should not be analysed again")
+
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(charsetrs, "_analyse_cached", fail_analyse)
         charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
 
-        # Read output as UTF-8
-        with open(temp_path, encoding="utf-8") as f:
-            content = f.read()
+    # Rewriting the file invalidates the cached verdict
+    with open(temp_path, "wb") as f:
+        f.write(b"Line 1\r\nLine 2\r\nLine 3\r\n")
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
 
-        assert "café" in content
-        assert "São Paulo" in content
-    finally:
-        os.unlink(temp_path)
+    with open(temp_path, "rb") as f:
+        assert f.read() == b"Line 1\nLine 2\nLine 3\n"
 
 
-def test_normalize_with_max_sample_size():
+def test_normalize_with_max_sample_size(tmp_path):
     """Test normalize() with custom max_sample_size parameter"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
+    temp_path = tmp_path / "input.txt"
+    with open(temp_path, "wb") as f:
         test_content = "Sample content\n" * 500
         f.write(test_content.encode("utf-8"))
-        temp_path = f.name
 
-    try:
-        # Normalize with small sample size for detection
-        charsetrs.normalize(
-            temp_path,
-            encoding="utf-8",
-            newlines="LF",
-            max_sample_size=512,
-        )
+    # Normalize with small sample size for detection
+    charsetrs.normalize(
+        temp_path,
+        encoding="utf-8",
+        newlines="LF",
+        max_sample_size=512,
+    )
 
-        with open(temp_path, encoding="utf-8") as f:
-            content = f.read()
+    with open(temp_path, encoding="utf-8") as f:
+        content = f.read()
 
-        assert "Sample content" in content
-    finally:
-        os.unlink(temp_path)
+    assert "Sample content" in content
 
 
-def test_normalize_invalid_newlines():
+def test_normalize_invalid_newlines(tmp_path):
     """Test that normalize() raises error for invalid newlines value"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"test\n")
-        temp_path = f.name
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"test\n")
+
+    with pytest.raises(ValueError) as exc_info:
+        charsetrs.normalize(temp_path, newlines="INVALID")  # type: ignore[arg-type]
+    assert "newlines" in str(exc_info.value).lower()
+
+
+def test_normalize_invalid_newlines_checked_before_file_access():
+    """Test that invalid newlines are rejected before the file is even opened"""
+    with pytest.raises(ValueError, match="newlines"):
+        charsetrs.normalize("/nonexistent/path/to/file.txt", newlines="INVALID")  # type: ignore[arg-type]
+
+
+def test_normalize_invalid_encoding(tmp_path):
+    """Test that normalize() raises LookupError for an unknown target encoding and leaves the file alone"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\r\nLine 2\r\n")
 
-    try:
-        with pytest.raises(ValueError) as exc_info:
-            charsetrs.normalize(temp_path, newlines="INVALID")  # type: ignore[arg-type]
-        assert "newlines" in str(exc_info.value).lower()
-    finally:
-        os.unlink(temp_path)
+    with pytest.raises(LookupError):
+        charsetrs.normalize(temp_path, encoding="not-a-real-encoding", newlines="LF")
+
+    with open(temp_path, "rb") as f:
+        assert f.read() == b"Line 1\r\nLine 2\r\n"
+
+
+@pytest.mark.parametrize(
+    "encoding_args",
+    [{"encoding": "replacement"}, {"encoding": "utf-8", "source_encoding": "csiso2022kr"}],
+    ids=["target", "source"],
+)
+def test_normalize_rejects_replacement_encoding_labels(tmp_path, encoding_args):
+    """Test that labels for the lossy WHATWG replacement encoding are rejected without touching the file"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\r\nLine 2\r\n")
+
+    with pytest.raises(LookupError):
+        charsetrs.normalize(temp_path, newlines="LF", **encoding_args)
+
+    assert temp_path.read_bytes() == b"Line 1\r\nLine 2\r\n"
+
+
+# "replacement" is a WHATWG label, but for an encoding that would destroy the file's contents
+@pytest.mark.parametrize("source_encoding", ["not-a-real-encoding", "replacement"])
+def test_normalize_invalid_source_encoding(tmp_path, source_encoding):
+    """Test that normalize() raises LookupError for an unusable source encoding and leaves the file alone"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\r\nLine 2\r\n")
+
+    with pytest.raises(LookupError, match="source encoding"):
+        charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF", source_encoding=source_encoding)
+
+    assert temp_path.read_bytes() == b"Line 1\r\nLine 2\r\n"
 
 
 def test_normalize_nonexistent_file():
@@ -290,53 +441,74 @@ def test_normalize_nonexistent_file():
         )
 
 
-def test_normalize_with_path_object():
+def test_normalize_with_path_object(tmp_path):
     """Test that normalize() works with Path objects"""
-    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
-        f.write(b"Test content\n")
-        temp_path = Path(f.name)
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Test content\n")
+
+    charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
+
+    assert temp_path.exists()
+
+
+def test_analyse_from_multiple_threads():
+    """Test that concurrent analyse() calls from threads return the same results as serial calls"""
+    expected = [charsetrs.analyse(path) for path in SAMPLE_FILES]
+    # Drop the memoized results so every threaded call analyses its file again
+    charsetrs._analyse_cached.cache_clear()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(charsetrs.analyse, SAMPLE_FILES))
+
+    assert results == expected
+
+
+def test_analyse_sees_changes_to_the_file(tmp_path):
+    """Test that a cached analyse() result is not reused after the file is rewritten"""
+    temp_path = tmp_path / "input.txt"
+    temp_path.write_bytes(b"Line 1\nLine 2\n")
+
+    assert charsetrs.analyse(temp_path).newlines == "LF"
+    assert charsetrs.analyse(temp_path).newlines == "LF"
+
+    with open(temp_path, "wb") as f:
+        f.write(b"Line 1\r\nLine 2\r\n")
+
+    assert charsetrs.analyse(temp_path).newlines == "CRLF"
+
+
+def test_analyse_many_matches_analyse():
+    """Test that analyse_many() returns the same results as analyse() in input order"""
+    results = charsetrs.analyse_many([str(path) for path in SAMPLE_FILES])
+
+    assert results == [charsetrs.analyse(path) for path in SAMPLE_FILES]
+
+
+def test_analyse_many_empty():
+    """Test that analyse_many() with no paths returns an empty list"""
+    assert charsetrs.analyse_many([]) == []
 
-    try:
-        charsetrs.normalize(temp_path, encoding="utf-8", newlines="LF")
 
-        assert temp_path.exists()
-    finally:
-        os.unlink(temp_path)
+def test_analyse_many_nonexistent_file():
+    """Test that analyse_many() raises FileNotFoundError if any path is missing"""
+    with pytest.raises(FileNotFoundError):
+        charsetrs.analyse_many([Path(__file__), "/nonexistent/path/to/file.txt"])
 
 
 # Tests for analyse() with actual test data files
 
 
-def test_analyse_sample_files():
+@pytest.mark.parametrize("sample_file", SAMPLE_FILES, ids=lambda path: path.name)
+def test_analyse_sample_files(sample_file, tmp_path):
     """Test analysis on sample data files"""
-    data_dir = Path(__file__).parent / "data"
-
-    if not data_dir.exists():
-        pytest.skip("Test data directory not found")
-
-    sample_files = list(data_dir.glob("*.txt"))
-
-    if not sample_files:
-        pytest.skip("No sample files found in test data directory")
-
-    # Test at least one file
-    for sample_file in sample_files[:5]:  # Test first 5 files
-        result = charsetrs.analyse(sample_file)
-        assert result is not None
-        assert isinstance(result, charsetrs.AnalysisResult)
-        assert len(result.encoding) > 0
-        assert result.newlines in ["LF", "CRLF", "CR"]
-
-        # Verify we can normalize the file
-        temp_copy = str(sample_file) + "_temp_copy.txt"
-        try:
-            # Create a temporary copy to normalize
-            import shutil
-
-            shutil.copy2(sample_file, temp_copy)
-            charsetrs.normalize(temp_copy, encoding="utf-8", newlines="LF")
-            assert os.path.exists(temp_copy)
-            assert os.path.getsize(temp_copy) > 0
-        finally:
-            if os.path.exists(temp_copy):
-                os.unlink(temp_copy)
+    result = charsetrs.analyse(sample_file)
+    assert result is not None
+    assert isinstance(result, charsetrs.AnalysisResult)
+    assert len(result.encoding) > 0
+    assert result.newlines in NEWLINE_STYLES
+
+    # Verify we can normalize the file
+    temp_copy = tmp_path / sample_file.name
+    shutil.copy2(sample_file, temp_copy)
+    charsetrs.normalize(temp_copy, encoding="utf-8", newlines="LF")
+    assert temp_copy.exists()
+    assert temp_copy.stat().st_size > 0